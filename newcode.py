@@ -3,11 +3,17 @@
 
 import sys
 import os
+import csv
+import json
+import math
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import Optional
 import sqlalchemy as sa
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, ForeignKey
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, relationship
 from sqlalchemy.exc import SQLAlchemyError
 
 # ────────────────────────────────────────────────
@@ -15,8 +21,56 @@ from sqlalchemy.exc import SQLAlchemyError
 # ────────────────────────────────────────────────
 
 Base = declarative_base()
-engine = create_engine("sqlite:///fintrack.db", echo=False)
-Session = sessionmaker(bind=engine)
+engine = create_engine(
+    "sqlite:///fintrack.db",
+    echo=False,
+    connect_args={"check_same_thread": False},
+)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    # Applied once per DBAPI connection; the pool keeps it (and its page cache) alive
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+# One long-lived session shared by every CLI action
+SESSION = scoped_session(sessionmaker(bind=engine))
+
+@contextmanager
+def transaction():
+    """Run the enclosed block in one transaction with a single commit.
+
+    Nested uses join the outermost transaction, so a script can wrap many
+    add_expense() calls in ``with transaction():`` and pay for one fsync.
+    """
+    session = SESSION()
+    if session.in_transaction():
+        yield session
+        return
+    session.begin()
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        # Ids created inside the rolled-back transaction no longer exist
+        _CATEGORY_ID_CACHE.clear()
+        raise
+    finally:
+        session.close()
+
+def raw_connection(session) -> sqlite3.Connection:
+    """The sqlite3 connection behind ``session``'s current transaction.
+
+    Hot paths run plain SQL on it to skip ORM and statement compilation
+    overhead while still committing or rolling back with transaction().
+    """
+    return session.connection().connection.driver_connection
 
 class Category(Base):
     __tablename__ = "categories"
@@ -29,10 +83,17 @@ class Expense(Base):
     id = Column(Integer, primary_key=True)
     title = Column(String(100), nullable=False)
     amount = Column(Float, nullable=False)
-    date = Column(Date, nullable=False, default=date.today)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    date = Column(Date, nullable=False, default=date.today, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+    # Denormalized copy of categories.name so listings and reports skip the join
+    category_name = Column(String(50), nullable=False, index=True)
     category = relationship("Category", back_populates="expenses")
 
+    __table_args__ = (
+        # Recent payments for a subscription are matched by expense title
+        sa.Index("ix_expenses_title_date", "title", "date"),
+    )
+
 class Budget(Base):
     __tablename__ = "budgets"
     id = Column(Integer, primary_key=True)
@@ -44,254 +105,433 @@ class Subscription(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     amount = Column(Float, nullable=False)
-    next_date = Column(Date, nullable=False)
+    next_date = Column(Date, nullable=False, index=True)
 
 # Create tables
 Base.metadata.create_all(engine)
 
+# Databases created before Expense.category_name existed need the column backfilled
+if "category_name" not in {c["name"] for c in sa.inspect(engine).get_columns("expenses")}:
+    with engine.begin() as conn:
+        conn.execute(sa.text(
+            "ALTER TABLE expenses ADD COLUMN category_name VARCHAR(50) NOT NULL DEFAULT ''"
+        ))
+        conn.execute(sa.text(
+            "UPDATE expenses SET category_name = "
+            "(SELECT name FROM categories WHERE categories.id = expenses.category_id)"
+        ))
+
+# create_all() skips indexes on tables that already exist
+for _table in Base.metadata.sorted_tables:
+    for _index in _table.indexes:
+        _index.create(engine, checkfirst=True)
+
 # ────────────────────────────────────────────────
 #                     HELPER FUNCTIONS
 # ────────────────────────────────────────────────
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
-def get_or_create_category(session, name: str) -> Category:
+# Lowercased category name -> id. Entries may be written inside an open
+# transaction; transaction() clears the cache if that transaction rolls back.
+_CATEGORY_ID_CACHE: dict[str, int] = {}
+
+def get_or_create_category(session, name: str) -> int:
+    """Return the id of category ``name``, creating it if needed.
+
+    Must run inside transaction(); the id is cached immediately.
+    """
     name = name.strip().lower()
-    cat = session.query(Category).filter_by(name=name).first()
-    if not cat:
-        cat = Category(name=name)
-        session.add(cat)
-        session.commit()
-    return cat
+    cat_id = _CATEGORY_ID_CACHE.get(name)
+    if cat_id is None:
+        cat_id = raw_connection(session).execute(
+            "INSERT INTO categories (name) VALUES (?) "
+            "ON CONFLICT (name) DO UPDATE SET name = excluded.name RETURNING id",
+            (name,),
+        ).fetchone()[0]
+        _CATEGORY_ID_CACHE[name] = cat_id
+    return cat_id
 
 def get_current_month() -> str:
     return datetime.now().strftime("%Y-%m")
 
+def month_bounds(month: str) -> tuple[date, date]:
+    """Return [first day of month, first day of next month) for a YYYY-MM string.
+
+    Raises ValueError if ``month`` is not a valid YYYY-MM.
+    """
+    digits = month[:4] + month[5:]
+    if len(month) != 7 or month[4] != "-" or not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"invalid month: {month!r}")
+    year, mon = int(month[:4]), int(month[5:7])
+    start = date(year, mon, 1)
+    end = date(year + (mon == 12), mon % 12 + 1, 1)
+    return start, end
+
 def parse_date(date_str: str) -> Optional[date]:
     if not date_str:
         return None
+    # Slicing a zero-padded YYYY-MM-DD is far cheaper than strptime() in bulk imports
+    y, m, d = date_str[0:4], date_str[5:7], date_str[8:10]
+    if (len(date_str) == 10 and date_str.isascii() and date_str[4] == "-" and date_str[7] == "-"
+            and y.isdigit() and m.isdigit() and d.isdigit()):
+        try:
+            return date(int(y), int(m), int(d))
+        except ValueError:
+            return None
+    # Anything else (e.g. unpadded 2026-3-5) goes through strptime as before
     try:
         return datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError:
         return None
 
-def color(text: str, code: str) -> str:
-    colors = {
-        "red": "\033[91m", "green": "\033[92m", "yellow": "\033[93m",
-        "cyan": "\033[96m", "reset": "\033[0m"
-    }
-    return f"{colors.get(code, '')}{text}{colors['reset']}"
+RED, GREEN, YELLOW, CYAN = "\033[91m", "\033[92m", "\033[93m", "\033[96m"
+_RESET = "\033[0m"
+
+def _colorizer(esc: str):
+    # Bakes the escape code into the closure so callers skip any lookup
+    return lambda text: f"{esc}{text}{_RESET}"
+
+c_red, c_green, c_yellow, c_cyan = map(_colorizer, (RED, GREEN, YELLOW, CYAN))
 
 # ────────────────────────────────────────────────
 #                     CORE FUNCTIONS
 # ────────────────────────────────────────────────
 
+# Fields: id, date, title, amount, category_name
+_EXPENSE_LINE = "#{0:4} | {1} | {2:<25} | ₹{3:>8.2f} | {4}\n"
+
+# Hot-path SQL, executed directly through raw_connection()
+_LIST_SQL = """
+    SELECT id, date, title, amount, category_name
+    FROM expenses
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+"""
+
+_CATEGORY_REPORT_SQL = """
+    SELECT category_name, SUM(amount) AS total
+    FROM expenses
+    WHERE date >= :start AND date < :end
+    GROUP BY category_name
+    ORDER BY total DESC
+"""
+
+_MONTH_TOTAL_SQL = """
+    SELECT COALESCE(SUM(amount), 0)
+    FROM expenses
+    WHERE date >= :start AND date < :end
+"""
+
+_BUDGET_STATUS_SQL = """
+    SELECT b."limit",
+           COALESCE((SELECT SUM(amount) FROM expenses
+                     WHERE date >= :start AND date < :end), 0)
+    FROM budgets b
+    WHERE b.month = :month
+"""
+
+# Each subscription with its last 5 matching payments as a JSON array
+_UPCOMING_SUBS_SQL = """
+    SELECT s.name, s.amount, s.next_date,
+           (SELECT json_group_array(json_object('date', p.date, 'amount', p.amount))
+            FROM (SELECT e.date, e.amount FROM expenses e
+                  WHERE e.title = s.name
+                  ORDER BY e.date DESC LIMIT 5) p) AS recent
+    FROM subscriptions s
+    WHERE s.next_date <= ?
+    ORDER BY s.next_date
+"""
+
+_YEAR_REPORT_SQL = """
+    SELECT category_name, SUM(amount) AS total
+    FROM expenses
+    WHERE date >= :start AND date < :end
+    GROUP BY category_name
+    ORDER BY total DESC
+"""
+
 def add_expense(title: str, amount: float, category_name: str, exp_date: str = ""):
-    session = Session()
     try:
-        cat = get_or_create_category(session, category_name)
-        d = parse_date(exp_date) or date.today()
-        
-        expense = Expense(title=title.strip(), amount=amount, date=d, category=cat)
-        session.add(expense)
-        session.commit()
-        print(color(f"✓ Added: {title} ₹{amount:.2f} ({cat.name}) on {d}", "green"))
+        cat_name = category_name.strip().lower()
+        with transaction() as session:
+            cat_id = get_or_create_category(session, cat_name)
+            d = parse_date(exp_date) or date.today()
+
+            raw_connection(session).execute(
+                "INSERT INTO expenses (title, amount, date, category_id, category_name) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (title.strip(), amount, d.isoformat(), cat_id, cat_name),
+            )
+        print(c_green(f"✓ Added: {title} ₹{amount:.2f} ({cat_name}) on {d}"))
+    except (SQLAlchemyError, sqlite3.Error) as e:
+        print(c_red(f"Error: {e}"))
+
+def add_expenses_bulk(rows: list[dict]) -> int:
+    """Insert many expenses in a single transaction.
+
+    Each row is a dict with ``title``, ``amount``, ``category`` and an optional
+    ``date`` (YYYY-MM-DD). Categories are resolved once for the whole batch.
+    Returns the number of expenses inserted.
+    """
+    if not rows:
+        return 0
+
+    names = {r["category"].strip().lower() for r in rows}
+    cat_ids = {n: _CATEGORY_ID_CACHE[n] for n in names if n in _CATEGORY_ID_CACHE}
+    with transaction():
+        unknown = names - cat_ids.keys()
+        if unknown:
+            cat_ids.update(SESSION.execute(
+                sa.select(Category.name, Category.id).where(Category.name.in_(unknown))
+            ).all())
+        missing = names - cat_ids.keys()
+        if missing:
+            SESSION.execute(sa.insert(Category), [{"name": n} for n in missing])
+            cat_ids.update(SESSION.execute(
+                sa.select(Category.name, Category.id).where(Category.name.in_(missing))
+            ).all())
+
+        today = date.today()
+        values = []
+        for r in rows:
+            name = r["category"].strip().lower()
+            values.append({
+                "title": r["title"].strip(),
+                "amount": r["amount"],
+                "date": parse_date(r.get("date", "")) or today,
+                "category_id": cat_ids[name],
+                "category_name": name,
+            })
+        SESSION.execute(sa.insert(Expense), values)
+        _CATEGORY_ID_CACHE.update(cat_ids)
+    return len(rows)
+
+IMPORT_CHUNK_SIZE = 10_000
+
+def import_expenses_csv(path: str):
+    """Import a CSV with columns title, amount, category[, date] in chunks."""
+    imported = skipped = 0
+    try:
+        # One transaction for the whole file: a failed import leaves no partial rows
+        with transaction(), open(path, newline="", encoding="utf-8-sig") as f:
+            chunk = []
+            for row in csv.DictReader(f):
+                try:
+                    title = (row.get("title") or "").strip()
+                    category = (row.get("category") or "").strip()
+                    amount = float(row.get("amount") or "")
+                    exp_date = (row.get("date") or "").strip()
+                    if not title or not category or not math.isfinite(amount) or amount <= 0:
+                        raise ValueError
+                    # Only a missing date defaults to today; a malformed one is rejected
+                    if exp_date and parse_date(exp_date) is None:
+                        raise ValueError
+                except ValueError:
+                    skipped += 1
+                    continue
+                chunk.append({"title": title, "amount": amount,
+                              "category": category, "date": exp_date})
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    imported += add_expenses_bulk(chunk)
+                    chunk = []
+            imported += add_expenses_bulk(chunk)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(c_red(f"Cannot read file: {e}"))
+        return
     except SQLAlchemyError as e:
-        session.rollback()
-        print(color(f"Error: {e}", "red"))
-    finally:
-        session.close()
+        print(c_red(f"Error: {e}"))
+        return
+
+    print(c_green(f"✓ Imported {imported} expenses from {path}"))
+    if skipped:
+        print(c_yellow(f"Skipped {skipped} invalid rows."))
 
 def delete_expense(expense_id: int):
-    session = Session()
     try:
-        exp = session.query(Expense).get(expense_id)
-        if not exp:
-            print(color(f"Expense #{expense_id} not found.", "red"))
-            return
-        title, amount, cat = exp.title, exp.amount, exp.category.name
-        session.delete(exp)
-        session.commit()
-        print(color(f"Deleted: {title} ₹{amount:.2f} ({cat})", "yellow"))
-    except SQLAlchemyError as e:
-        session.rollback()
-        print(color(f"Error: {e}", "red"))
-    finally:
-        session.close()
+        with transaction() as session:
+            exp = raw_connection(session).execute(
+                "DELETE FROM expenses WHERE id = ? RETURNING title, amount, category_name",
+                (expense_id,),
+            ).fetchone()
+            if not exp:
+                print(c_red(f"Expense #{expense_id} not found."))
+                return
+            title, amount, cat = exp
+        print(c_yellow(f"Deleted: {title} ₹{amount:.2f} ({cat})"))
+    except (SQLAlchemyError, sqlite3.Error) as e:
+        print(c_red(f"Error: {e}"))
 
 def list_expenses(limit: int = 15):
-    session = Session()
-    try:
-        exps = (session.query(Expense)
-                .order_by(Expense.date.desc(), Expense.id.desc())
-                .limit(limit).all())
-        
-        if not exps:
-            print("No expenses yet.")
-            return
-        
-        print("\nRecent Expenses:")
-        print("-"*70)
-        for e in exps:
-            print(f"#{e.id:4} | {e.date} | {e.title:<25} | ₹{e.amount:>8.2f} | {e.category.name}")
-        print("-"*70)
-    finally:
-        session.close()
+    with transaction() as session:
+        exps = raw_connection(session).execute(_LIST_SQL, (limit,)).fetchall()
+
+    if not exps:
+        print("No expenses yet.")
+        return
+
+    print("\nRecent Expenses:")
+    print("-"*70)
+    sys.stdout.write("".join(_EXPENSE_LINE.format(*e) for e in exps))
+    print("-"*70)
 
 def search_expenses(start_date: str = "", end_date: str = ""):
-    session = Session()
-    try:
-        query = session.query(Expense).order_by(Expense.date.desc())
-        
+    with transaction():
+        query = (SESSION.query(Expense.id, Expense.date, Expense.title, Expense.amount,
+                               Expense.category_name)
+                 .order_by(Expense.date.desc()))
+
         if start_date:
             sd = parse_date(start_date)
             if sd:
                 query = query.filter(Expense.date >= sd)
             else:
-                print(color("Invalid start date format (use YYYY-MM-DD)", "red"))
-        
+                print(c_red("Invalid start date format (use YYYY-MM-DD)"))
+
         if end_date:
             ed = parse_date(end_date)
             if ed:
                 query = query.filter(Expense.date <= ed)
             else:
-                print(color("Invalid end date format (use YYYY-MM-DD)", "red"))
-        
-        results = query.all()
-        
-        if not results:
+                print(c_red("Invalid end date format (use YYYY-MM-DD)"))
+
+        count = query.order_by(None).with_entities(sa.func.count(Expense.id)).scalar()
+        if not count:
             print("No expenses found in this date range.")
             return
-        
-        print(f"\nExpenses found: {len(results)}")
+
+        print(f"\nExpenses found: {count}")
         print("-"*70)
-        for e in results:
-            print(f"#{e.id:4} | {e.date} | {e.title:<25} | ₹{e.amount:>8.2f} | {e.category.name}")
+        # Stream in fixed-size batches so memory stays flat for wide ranges
+        result = SESSION.execute(query.statement, execution_options={"yield_per": 500})
+        for batch in result.partitions():
+            sys.stdout.write("".join(_EXPENSE_LINE.format(*e) for e in batch))
         print("-"*70)
-    finally:
-        session.close()
 
 def category_report(month: str = ""):
     if not month:
         month = get_current_month()
-    
-    session = Session()
+
     try:
-        sql = """
-        SELECT c.name, COALESCE(SUM(e.amount), 0) as total
-        FROM categories c
-        LEFT JOIN expenses e ON c.id = e.category_id
-            AND strftime('%Y-%m', e.date) = :month
-        GROUP BY c.name
-        ORDER BY total DESC
-        """
-        result = session.execute(sa.text(sql), {"month": month}).fetchall()
-        
-        if not result or all(r[1] == 0 for r in result):
-            print(f"No spending in {month}")
-            return
-        
-        print(f"\nCategory Report – {month}")
-        print("-"*50)
-        total = 0
-        for cat, amt in result:
-            if amt > 0:
-                print(f"{cat:18} ₹{amt:>10.2f}")
-                total += amt
-        print("-"*50)
-        print(f"Total: ₹{total:>10.2f}")
-    finally:
-        session.close()
+        start, end = month_bounds(month)
+    except ValueError:
+        print(c_red("Invalid month. Use YYYY-MM"))
+        return
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+
+    with transaction() as session:
+        conn = raw_connection(session)
+        result = conn.execute(_CATEGORY_REPORT_SQL, params).fetchall()
+        total = conn.execute(_MONTH_TOTAL_SQL, params).fetchone()[0]
+
+    if not result:
+        print(f"No spending in {month}")
+        return
+
+    print(f"\nCategory Report – {month}")
+    print("-"*50)
+    for cat, amt in result:
+        print(f"{cat:18} ₹{amt:>10.2f}")
+    print("-"*50)
+    print(f"Total: ₹{total:>10.2f}")
+
+def yearly_report(year: str = ""):
+    if not year:
+        year = str(date.today().year)
+    try:
+        y = int(year)
+        start, end = date(y, 1, 1), date(y + 1, 1, 1)
+    except ValueError:
+        print(c_red("Invalid year. Use YYYY"))
+        return
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+
+    with transaction() as session:
+        result = raw_connection(session).execute(_YEAR_REPORT_SQL, params).fetchall()
+
+    if not result:
+        print(f"No spending in {year}")
+        return
+
+    print(f"\nYearly Category Report – {year}")
+    print("-"*50)
+    for cat, amt in result:
+        print(f"{cat:18} ₹{amt:>10.2f}")
+    print("-"*50)
+    print(f"Total: ₹{sum(amt for _, amt in result):>10.2f}")
 
 def budget_status():
     month = get_current_month()
-    session = Session()
-    try:
-        budget = session.query(Budget).filter_by(month=month).first()
-        if not budget:
-            print(f"No budget set for {month}. Use option 7 to set.")
-            return
-        
-        sql = """
-        SELECT COALESCE(SUM(amount), 0)
-        FROM expenses
-        WHERE strftime('%Y-%m', date) = :month
-        """
-        spent = session.execute(sa.text(sql), {"month": month}).scalar() or 0.0
-        
-        percent = (spent / budget.limit * 100) if budget.limit > 0 else 0
-        status_color = "green" if percent < 80 else "yellow" if percent < 100 else "red"
-        status_text = "GOOD" if percent < 80 else "CAUTION" if percent < 100 else "OVER BUDGET!"
-        
-        print(f"\nBudget {month}: ₹{budget.limit:,.2f}")
-        print(f"Spent:        ₹{spent:,.2f} ({percent:.1f}%)")
-        print(color(f"Status: {status_text}", status_color))
-    finally:
-        session.close()
+    start, end = month_bounds(month)
+    with transaction() as session:
+        row = raw_connection(session).execute(
+            _BUDGET_STATUS_SQL,
+            {"month": month, "start": start.isoformat(), "end": end.isoformat()},
+        ).fetchone()
+    if not row:
+        print(f"No budget set for {month}. Use option 7 to set.")
+        return
+    limit, spent = row
+
+    percent = (spent / limit * 100) if limit > 0 else 0
+    status_color = c_green if percent < 80 else c_yellow if percent < 100 else c_red
+    status_text = "GOOD" if percent < 80 else "CAUTION" if percent < 100 else "OVER BUDGET!"
+
+    print(f"\nBudget {month}: ₹{limit:,.2f}")
+    print(f"Spent:        ₹{spent:,.2f} ({percent:.1f}%)")
+    print(status_color(f"Status: {status_text}"))
 
 def set_budget(limit: float, month: str = ""):
     if not month:
         month = get_current_month()
-    session = Session()
     try:
-        b = session.query(Budget).filter_by(month=month).first()
-        if b:
-            b.limit = limit
-        else:
-            b = Budget(month=month, limit=limit)
-            session.add(b)
-        session.commit()
-        print(color(f"Budget set for {month}: ₹{limit:,.2f}", "green"))
+        with transaction():
+            SESSION.execute(
+                sqlite_insert(Budget).values(month=month, limit=limit)
+                .on_conflict_do_update(index_elements=[Budget.month], set_={"limit": limit})
+            )
+        print(c_green(f"Budget set for {month}: ₹{limit:,.2f}"))
     except SQLAlchemyError as e:
-        session.rollback()
-        print(color(f"Error: {e}", "red"))
-    finally:
-        session.close()
+        print(c_red(f"Error: {e}"))
 
 def add_subscription(name: str, amount: float, next_date_str: str):
     d = parse_date(next_date_str)
     if not d:
-        print(color("Invalid date. Use YYYY-MM-DD", "red"))
+        print(c_red("Invalid date. Use YYYY-MM-DD"))
         return
-    
-    session = Session()
+
     try:
-        sub = Subscription(name=name.strip(), amount=amount, next_date=d)
-        session.add(sub)
-        session.commit()
-        print(color(f"Subscription added: {name} ₹{amount:.2f} due on {d}", "green"))
+        with transaction():
+            sub = Subscription(name=name.strip(), amount=amount, next_date=d)
+            SESSION.add(sub)
+        print(c_green(f"Subscription added: {name} ₹{amount:.2f} due on {d}"))
     except SQLAlchemyError as e:
-        session.rollback()
-        print(color(f"Error: {e}", "red"))
-    finally:
-        session.close()
+        print(c_red(f"Error: {e}"))
 
 def list_upcoming_subscriptions(days: int = 30):
-    session = Session()
-    try:
-        today = date.today()
-        soon = today + timedelta(days=days)
-        
-        subs = (session.query(Subscription)
-                .filter(Subscription.next_date <= soon)
-                .order_by(Subscription.next_date)
-                .all())
-        
-        if not subs:
-            print(f"No subscriptions due in next {days} days.")
-            return
-        
-        print(f"\nUpcoming Subscriptions (next {days} days):")
-        print("-"*60)
-        for s in subs:
-            days_left = (s.next_date - today).days
-            days_text = f"in {days_left} days" if days_left > 0 else "TODAY!" if days_left == 0 else f"{-days_left} days overdue"
-            color_code = "red" if days_left <= 0 else "yellow" if days_left <= 7 else "green"
-            print(color(f"{s.name:20} ₹{s.amount:>8.2f}  {s.next_date} ({days_text})", color_code))
-        print("-"*60)
-    finally:
-        session.close()
+    today = date.today()
+    soon = today + timedelta(days=days)
+
+    with transaction() as session:
+        subs = raw_connection(session).execute(_UPCOMING_SUBS_SQL, (soon.isoformat(),)).fetchall()
+
+    if not subs:
+        print(f"No subscriptions due in next {days} days.")
+        return
+
+    print(f"\nUpcoming Subscriptions (next {days} days):")
+    print("-"*60)
+    for name, amount, next_date, recent in subs:
+        days_left = (parse_date(next_date) - today).days
+        days_text = f"in {days_left} days" if days_left > 0 else "TODAY!" if days_left == 0 else f"{-days_left} days overdue"
+        esc = RED if days_left <= 0 else YELLOW if days_left <= 7 else GREEN
+        print(f"{esc}{name:20} ₹{amount:>8.2f}  {next_date} ({days_text}){_RESET}")
+        payments = json.loads(recent)
+        if payments:
+            print("    recent: " + ", ".join(f"{p['date']} ₹{p['amount']:.2f}" for p in payments))
+    print("-"*60)
 
 # ────────────────────────────────────────────────
 #                     MENU & MAIN LOOP
@@ -312,15 +552,19 @@ def show_menu():
     print(" 8. Add Subscription")
     print(" 9. Show Upcoming Subscriptions")
     print("10. Clear Screen")
+    print("11. Import Expenses from CSV")
+    print("12. Yearly Category Report")
     print(" 0. Exit")
     print("="*55)
 
 def main():
+    if os.name == 'nt':
+        os.system("")  # enables ANSI escape handling in legacy Windows consoles
     print("FinTrack Pro starting... (SQLite database: fintrack.db)")
     
     while True:
         show_menu()
-        choice = input("\nEnter your choice (0-10): ").strip()
+        choice = input("\nEnter your choice (0-12): ").strip()
 
         if choice == "0":
             print("\nThank you for using FinTrack Pro. Goodbye!")
@@ -329,18 +573,18 @@ def main():
         elif choice == "1":
             title = input("Title: ").strip()
             if not title:
-                print(color("Title is required.", "red"))
+                print(c_red("Title is required."))
                 continue
             try:
                 amount = float(input("Amount (₹): "))
                 if amount <= 0:
                     raise ValueError
             except ValueError:
-                print(color("Enter a valid positive amount.", "red"))
+                print(c_red("Enter a valid positive amount."))
                 continue
             category = input("Category: ").strip()
             if not category:
-                print(color("Category is required.", "red"))
+                print(c_red("Category is required."))
                 continue
             date_str = input("Date (YYYY-MM-DD) [today]: ").strip()
             add_expense(title, amount, category, date_str)
@@ -350,7 +594,7 @@ def main():
                 eid = int(input("Expense ID to delete: "))
                 delete_expense(eid)
             except ValueError:
-                print(color("Please enter a valid number.", "red"))
+                print(c_red("Please enter a valid number."))
 
         elif choice == "3":
             list_expenses()
@@ -374,19 +618,19 @@ def main():
                     raise ValueError
                 set_budget(limit)
             except ValueError:
-                print(color("Enter a valid positive number.", "red"))
+                print(c_red("Enter a valid positive number."))
 
         elif choice == "8":
             name = input("Subscription name: ").strip()
             if not name:
-                print(color("Name required.", "red"))
+                print(c_red("Name required."))
                 continue
             try:
                 amount = float(input("Amount (₹): "))
                 if amount <= 0:
                     raise ValueError
             except ValueError:
-                print(color("Invalid amount.", "red"))
+                print(c_red("Invalid amount."))
                 continue
             next_date = input("Next due date (YYYY-MM-DD): ").strip()
             add_subscription(name, amount, next_date)
@@ -396,10 +640,21 @@ def main():
 
         elif choice == "10":
             clear_screen()
-            print(color("Screen cleared.", "cyan"))
+            print(c_cyan("Screen cleared."))
+
+        elif choice == "11":
+            path = input("CSV file (title,amount,category,date): ").strip()
+            if not path:
+                print(c_red("File path required."))
+                continue
+            import_expenses_csv(path)
+
+        elif choice == "12":
+            year = input("Year (YYYY) [current]: ").strip()
+            yearly_report(year)
 
         else:
-            print(color("Invalid choice. Please try again.", "red"))
+            print(c_red("Invalid choice. Please try again."))
 
         input("\nPress Enter to continue...")
 
@@ -409,6 +664,6 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\n\nExited by user.")
     except Exception as e:
-        print(color(f"Unexpected error: {e}", "red"))
+        print(c_red(f"Unexpected error: {e}"))
 
 